@@ -1,22 +1,281 @@
 # -*- coding: utf-8 -*-
 """Collects Timesketch events."""
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import heapq
+import itertools
+import json
+import os
 import tempfile
-from typing import List
+from typing import (
+    Any, Callable, Dict, IO, Iterable, Iterator, List, TypeVar)
 
 import pandas as pd
 from timesketch_api_client import client
 from timesketch_api_client import search
 from timesketch_api_client import sketch
 
+from dftimewolf.lib import errors
 from dftimewolf.lib import module
 from dftimewolf.lib import state as state_lib
 from dftimewolf.lib import timesketch_utils
 from dftimewolf.lib.containers import containers
 from dftimewolf.lib.modules import manager as modules_manager
 
+try:
+  import orjson
+  HAS_ORJSON = True
+except ImportError:
+  HAS_ORJSON = False
 
-_VALID_OUTPUT_FORMATS = frozenset(['csv', 'json', 'jsonl', 'pandas'])
+try:
+  import pyarrow
+  from pyarrow import csv as pyarrow_csv
+  from pyarrow import parquet as pyarrow_parquet
+  HAS_PYARROW = True
+except ImportError:
+  HAS_PYARROW = False
+
+_INTERNAL_COLUMNS = frozenset(
+    ['__ts_timeline_id', '_id', '_index', '_source', '_type'])
+# Size of the write buffer of output files, large exports are flushed to disk
+# in a few big writes instead of many small ones.
+_OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+# Number of concurrent per index searches.
+_SEARCH_THREAD_POOL_SIZE = 4  # Arbitrary
+# Maximum number of events returned by a single Timesketch search, per index
+# searches are capped to it once merged.
+_SEARCH_SIZE_LIMIT = search.Search.DEFAULT_SIZE_LIMIT
+
+
+T = TypeVar('T')
+
+
+def _DumpJson(record: Dict[str, Any]) -> bytes:
+  """Serializes a record to compact UTF-8 encoded JSON.
+
+  Uses orjson when available, falling back to the standard library, which
+  writes the same compact separators, for records orjson cannot serialize,
+  such as integers beyond 64 bits.
+
+  Args:
+    record: the record to serialize.
+
+  Returns:
+    the JSON serialized record.
+  """
+  if HAS_ORJSON:
+    try:
+      return orjson.dumps(record)
+    except orjson.JSONEncodeError:
+      pass
+  return json.dumps(
+      record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _TimestampToIsoFormat(timestamp: Any) -> str | None:
+  """Converts a Timesketch timestamp to an ISO 8601 datetime.
+
+  Args:
+    timestamp: the number of microseconds since the epoch.
+
+  Returns:
+    the ISO 8601 formatted datetime in UTC, or None if the timestamp is not
+    a number or out of range.
+  """
+  if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+    return None
+  try:
+    return (datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc) +
+            datetime.timedelta(microseconds=timestamp)).isoformat()
+  except (OverflowError, OSError, ValueError):
+    return None
+
+
+def _GetCsvColumns(
+    records: List[Dict[str, Any]],
+    fieldnames: List[str]) -> Dict[str, List[Any]]:
+  """Gets the records as CSV columns with a single value type each.
+
+  Columns only holding 64-bit integers or only holding strings are kept as is.
+  The values of any other column, such as nested tags and labels, booleans,
+  floats or mixed types, are converted to strings. Both CSV writers can then
+  write every column, with the same output.
+
+  Args:
+    records: the records containing the Timesketch events.
+    fieldnames: the fields of the records, in output order.
+
+  Returns:
+    the values of each field, None for events missing the field.
+  """
+  columns = {}
+  for field in fieldnames:
+    values = [record.get(field) for record in records]
+    present = [value for value in values if value is not None]
+    value_types = {type(value) for value in present}
+    if value_types == {int} and (
+        -2**63 <= min(present) and max(present) < 2**63):
+      columns[field] = values
+    elif value_types <= {str}:
+      columns[field] = values
+    else:
+      columns[field] = [
+          None if value is None else str(value) for value in values]
+  return columns
+
+
+def _FormatCsvValue(value: int | str | None) -> str:
+  """Formats a CSV value the way the pyarrow CSV writer does.
+
+  Strings are always quoted, integers and missing values never are.
+
+  Args:
+    value: the value to format.
+
+  Returns:
+    the formatted value.
+  """
+  if value is None:
+    return ''
+  if isinstance(value, int):
+    return str(value)
+  return '"' + value.replace('"', '""') + '"'
+
+
+def _WriteCsv(
+    records: Iterable[Dict[str, Any]], output_file: IO[bytes]) -> None:
+  """Writes records to a CSV file.
+
+  The header and string values are quoted, and lines end with a line feed.
+
+  Args:
+    records: the records containing the Timesketch events.
+    output_file: the binary file to write the records to.
+  """
+  # Events do not necessarily share the same fields, so the header is the
+  # union of all fields in order of first appearance.
+  records = list(records)
+  fieldnames = list(dict.fromkeys(
+      field for record in records for field in record))
+  columns = _GetCsvColumns(records, fieldnames)
+  if HAS_PYARROW:
+    pyarrow_csv.write_csv(
+        pyarrow.table(columns),
+        output_file,
+        write_options=pyarrow_csv.WriteOptions(
+            quoting_style='needed', eol='\n'))
+    return
+
+  output_file.write(
+      (','.join(map(_FormatCsvValue, fieldnames)) + '\n').encode('utf-8'))
+  for row in zip(*columns.values()):
+    output_file.write(
+        (','.join(map(_FormatCsvValue, row)) + '\n').encode('utf-8'))
+
+
+def _WriteJson(
+    records: Iterable[Dict[str, Any]], output_file: IO[bytes]) -> None:
+  """Writes records to a JSON file as an array, one record at a time.
+
+  Args:
+    records: the records containing the Timesketch events.
+    output_file: the binary file to write the records to.
+  """
+  output_file.write(b'[')
+  for index, record in enumerate(records):
+    if index:
+      output_file.write(b',')
+    output_file.write(_DumpJson(record))
+  output_file.write(b']')
+
+
+def _WriteJsonl(
+    records: Iterable[Dict[str, Any]], output_file: IO[bytes]) -> None:
+  """Writes records to a JSON lines file.
+
+  Args:
+    records: the records containing the Timesketch events.
+    output_file: the binary file to write the records to.
+  """
+  for record in records:
+    output_file.write(_DumpJson(record) + b'\n')
+
+
+def _GetParquetColumns(
+    records: List[Dict[str, Any]],
+    fieldnames: List[str]) -> Dict[str, Any]:
+  """Gets the records as Parquet columns with a single value type each.
+
+  The datetime column is converted to UTC timestamps. The values of a column
+  pyarrow cannot convert, such as a field holding a string in one event and a
+  number in another, or integers beyond 64 bits, are converted to strings.
+
+  Args:
+    records: the records containing the Timesketch events.
+    fieldnames: the fields of the records, in output order.
+
+  Returns:
+    the pyarrow array of each field, null for events missing the field.
+  """
+  columns = {}
+  for field in fieldnames:
+    values = [record.get(field) for record in records]
+    if field == 'datetime':
+      try:
+        columns[field] = pyarrow.array(
+            pd.to_datetime(
+                pd.Series(values, dtype=object), utc=True,
+                format='ISO8601').dt.floor('us'),
+            type=pyarrow.timestamp('us', tz='UTC'))
+        continue
+      except (ValueError, TypeError, pyarrow.ArrowException):
+        pass
+    try:
+      columns[field] = pyarrow.array(values)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+      columns[field] = pyarrow.array(
+          [None if value is None else str(value) for value in values],
+          type=pyarrow.string())
+  return columns
+
+
+def _WriteParquet(
+    records: Iterable[Dict[str, Any]], output_file: IO[bytes]) -> None:
+  """Writes records to a zstd compressed Parquet file.
+
+  Args:
+    records: the records containing the Timesketch events.
+    output_file: the binary file to write the records to.
+
+  Raises:
+    DFTimewolfError: if the records cannot be written as Parquet.
+  """
+  # Parquet is columnar, so the records are converted to a table first.
+  # pyarrow dictionary encodes repeated values such as data_type.
+  records = list(records)
+  fieldnames = list(dict.fromkeys(
+      field for record in records for field in record))
+  try:
+    pyarrow_parquet.write_table(
+        pyarrow.table(_GetParquetColumns(records, fieldnames)),
+        output_file,
+        compression='zstd')
+  except pyarrow.ArrowException as exception:
+    raise errors.DFTimewolfError(
+        f'Unable to write parquet output: {exception!s}',
+        critical=True) from exception
+
+
+# Writers of the file output formats, the 'pandas' output format stores a
+# dataframe container instead.
+_OUTPUT_WRITERS: Dict[
+    str, Callable[[Iterable[Dict[str, Any]], IO[bytes]], None]] = {
+        'csv': _WriteCsv,
+        'json': _WriteJson,
+        'jsonl': _WriteJsonl,
+        'parquet': _WriteParquet,
+    }
 
 
 class TimesketchSearchEventCollector(module.BaseModule):
@@ -35,6 +294,8 @@ class TimesketchSearchEventCollector(module.BaseModule):
     search_name: an optional name for the search.
     search_description: an optional description for the search.
     include_internal_columns: show Timesketch internal columns.
+    output_dir: the directory to write output files to, the system temporary
+        directory if not set.
     sketch_id: the Timesketch sketch ID.
     sketch: the Timesketch sketch.
   """
@@ -51,6 +312,8 @@ class TimesketchSearchEventCollector(module.BaseModule):
     self.query_string: str = ''
     self.start_datetime: datetime.datetime | None = None
     self.end_datetime: datetime.datetime | None = None
+    self._start_iso: str = ''
+    self._end_iso: str = ''
     self.indices: List[int] = []
     self.labels: List[str] = []
     self.output_format: str = ''
@@ -58,6 +321,7 @@ class TimesketchSearchEventCollector(module.BaseModule):
     self.search_name: str = ''
     self.search_description: str = ''
     self.include_internal_columns: bool = False
+    self.output_dir: str | None = None
     self.sketch_id: int = 0
     self.sketch: sketch.Sketch | None = None
 
@@ -78,7 +342,8 @@ class TimesketchSearchEventCollector(module.BaseModule):
       token_password: str = '',
       endpoint: str | None = None,
       username: str | None = None,
-      password: str | None = None
+      password: str | None = None,
+      output_dir: str | None = None
   ) -> None:
     """Sets up the TimesketchSearchEventCollector.
 
@@ -104,6 +369,9 @@ class TimesketchSearchEventCollector(module.BaseModule):
           Optional when token_password is provided.
       username: Timesketch username. Optional when token_password is provided.
       password: Timesketch password. Optional when token_password is provided.
+      output_dir: the directory to write output files to.  Writing them on
+          the same filesystem as their consumers avoids copying large exports.
+          Defaults to the system temporary directory.
     """
     if not sketch_id:
       attributes = self.GetContainers(containers.TicketAttribute)
@@ -119,14 +387,26 @@ class TimesketchSearchEventCollector(module.BaseModule):
       self.ModuleError(
           'Both the start and end datetime must be set.', critical=True)
 
-    if output_format not in _VALID_OUTPUT_FORMATS:
+    if output_format not in _OUTPUT_WRITERS and output_format != 'pandas':
       self.ModuleError(
-          f'Output format not one of {",".join(_VALID_OUTPUT_FORMATS)}',
+          f'Output format not one of {",".join([*_OUTPUT_WRITERS, "pandas"])}',
+          critical=True)
+
+    if output_format == 'parquet' and not HAS_PYARROW:
+      self.ModuleError(
+          'The parquet output format requires pyarrow, install the optional '
+          'parquet dependency group with: poetry install --with parquet',
           critical=True)
 
     self.sketch = self._GetSketch(token_password, endpoint, username, password)
     self.start_datetime = start_datetime
     self.end_datetime = end_datetime
+    if start_datetime and end_datetime:
+      # The date range chip expects timezone naive ISO 8601 strings.
+      self._start_iso = start_datetime.replace(tzinfo=None).isoformat(
+          timespec='microseconds')
+      self._end_iso = end_datetime.replace(tzinfo=None).isoformat(
+          timespec='microseconds')
     self.query_string = query_string
     self.return_fields = return_fields
     self.output_format = output_format
@@ -144,6 +424,10 @@ class TimesketchSearchEventCollector(module.BaseModule):
     if search_description:
       self.search_description = search_description
 
+    if output_dir:
+      os.makedirs(output_dir, exist_ok=True)
+      self.output_dir = output_dir
+
   def _GetSketch(
       self,
       token_password: str | None = None,
@@ -166,8 +450,21 @@ class TimesketchSearchEventCollector(module.BaseModule):
     Returns:
       The Timesketch sketch.
     """
+    # Reuse the sketch, and its authenticated API client, of an earlier module.
+    # The cache does not record the server of the sketch, so it is only used
+    # when no explicit server is given.
+    cached_sketch = self.state.GetFromCache('timesketch_sketch')
+    if (not endpoint and cached_sketch and
+        cached_sketch.id == self.sketch_id):
+      return cached_sketch
+
     if endpoint and username and password:
-      timesketch_api = client.TimesketchApi(endpoint, username, password)
+      cache_key = f'timesketch_client_{endpoint}_{username}'
+      timesketch_api = self.state.GetFromCache(cache_key)
+      if not timesketch_api:
+        timesketch_api = client.TimesketchApi(endpoint, username, password)
+        timesketch_utils.ConfigureConnectionPool(timesketch_api)
+        self.state.AddToCache(cache_key, timesketch_api)
     elif token_password:
       timesketch_api = timesketch_utils.GetApiClient(
           self.state, token_password=token_password)
@@ -188,24 +485,45 @@ class TimesketchSearchEventCollector(module.BaseModule):
     self.state.AddToCache('timesketch_sketch', sketch_obj)
     return sketch_obj
 
-  def _GetSearchResults(self) -> pd.DataFrame:
-    """Get the Timesketch search results.
+  def _GetReturnFields(self) -> str:
+    """Gets the fields to request from Timesketch.
+
+    Internal columns that are not to be included are left out of an explicit
+    list of return fields, so they are neither sent by the server nor
+    materialized in the results.
 
     Returns:
-      the results in a Pandas dataframe.
+      the comma-separated Timesketch return fields.
+    """
+    if self.include_internal_columns or self.return_fields in ('', '*'):
+      return self.return_fields
+    fields = [
+        field for field in self.return_fields.strip("'").split(',')
+        if field.strip() not in _INTERNAL_COLUMNS]
+    return ','.join(fields) or self.return_fields
+
+  def _BuildSearch(self, indices: List[int]) -> search.Search:
+    """Builds the Timesketch search object.
+
+    Args:
+      indices: the Timesketch indices to search, all indices if empty.
+
+    Returns:
+      the search object with the query, indices and chips set.
     """
     search_obj = search.Search(self.sketch)
     search_obj.query_string = self.query_string
-    search_obj.return_fields = self.return_fields
-    if self.indices:
-      search_obj.indices = self.indices
+    search_obj.return_fields = self._GetReturnFields()
+    if indices:
+      # The indices were checked against the sketch timelines already, the
+      # setter would list the timelines again for every search.
+      search_obj._indices = [  # pylint: disable=protected-access
+          str(index) for index in indices]
 
-    if self.start_datetime and self.end_datetime:
+    if self._start_iso and self._end_iso:
       range_chip = search.DateRangeChip()
-      range_chip.add_start_time(
-          self.start_datetime.strftime('%Y-%m-%dT%H:%M:%S.%f'))
-      range_chip.add_end_time(
-          self.end_datetime.strftime('%Y-%m-%dT%H:%M:%S.%f'))
+      range_chip.add_start_time(self._start_iso)
+      range_chip.add_end_time(self._end_iso)
       search_obj.add_chip(range_chip)
 
     for label in self.labels:
@@ -217,7 +535,145 @@ class TimesketchSearchEventCollector(module.BaseModule):
       else:
         label_chip.label = label
       search_obj.add_chip(label_chip)
-    return search_obj.to_pandas()
+    return search_obj
+
+  def _GetValidIndices(self) -> List[int]:
+    """Gets the Timesketch indices that are timelines of the sketch.
+
+    Unknown indices, such as typos or deleted timelines, are dropped with a
+    warning. Searching them would otherwise search all timelines.
+
+    Returns:
+      the valid Timesketch indices, all indices if empty.
+    """
+    if not self.indices or not self.sketch:
+      return []
+
+    timeline_ids = {timeline.id for timeline in self.sketch.list_timelines()}
+    indices = [index for index in self.indices if index in timeline_ids]
+    invalid_indices = [
+        index for index in self.indices if index not in timeline_ids]
+    if invalid_indices:
+      self.logger.warning(
+          f'Skipping indices not in sketch {self.sketch_id}: '
+          f'{",".join(map(str, invalid_indices))}')
+    if not indices:
+      self.ModuleError(
+          f'None of the indices {",".join(map(str, self.indices))} are '
+          f'timelines of sketch {self.sketch_id}', critical=True)
+    return indices
+
+  def _RunSearches(self, run_search: Callable[[search.Search], T]) -> List[T]:
+    """Runs the Timesketch search, concurrently per index if several are set.
+
+    Args:
+      run_search: function executing a search object and returning its
+          results.
+
+    Returns:
+      the results of each search, in the order of the indices.
+    """
+    indices = self._GetValidIndices()
+    if len(indices) <= 1:
+      return [run_search(self._BuildSearch(indices))]
+
+    # The searches share the requests session of the API client. This is safe
+    # as the searches only read its headers and credentials, the cookie jar
+    # is locked and the urllib3 connection pools, sized by
+    # timesketch_utils.ConfigureConnectionPool() to more connections than
+    # threads, are thread-safe.
+    search_futures = []
+    with ThreadPoolExecutor(_SEARCH_THREAD_POOL_SIZE) as executor:
+      for index in indices:
+        search_futures.append(
+            executor.submit(run_search, self._BuildSearch([index])))
+    return [search_future.result() for search_future in search_futures]
+
+  def _HitsToDataFrame(self, hits: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Converts the search hits to a dataframe.
+
+    The hits of all indices are merged before the conversion, the result
+    matches search.Search.to_pandas().
+
+    Args:
+      hits: the hits as returned by the Timesketch API.
+
+    Returns:
+      the results in a Pandas dataframe.
+    """
+    data_frame: pd.DataFrame = pd.DataFrame(list(self._IterHits(hits)))
+    if 'datetime' in data_frame:
+      try:
+        data_frame['datetime'] = pd.to_datetime(
+            data_frame['datetime'], format='mixed')
+      except pd.errors.OutOfBoundsDatetime:
+        pass
+    return data_frame
+
+  def _GetSearchHits(self) -> List[Dict[str, Any]]:
+    """Get the raw Timesketch search hits.
+
+    Returns:
+      the hits as returned by the Timesketch API.
+    """
+    hits_per_index: List[List[Dict[str, Any]]] = self._RunSearches(
+        lambda search_obj: search_obj.to_dict().get('objects', []))
+    if len(hits_per_index) == 1:
+      return hits_per_index[0]
+
+    # Each search returns its hits in datetime order, merge them accordingly
+    # and keep as many as a single search over all indices would return.
+    return list(itertools.islice(
+        heapq.merge(
+            *hits_per_index,
+            key=lambda hit: str(hit.get('_source', {}).get('datetime', ''))),
+        _SEARCH_SIZE_LIMIT))
+
+  def _IterHits(
+      self, hits: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Iterates over the search hits as records.
+
+    The hits are converted to records one at a time, without building an
+    intermediate dataframe.
+
+    Args:
+      hits: the hits as returned by the Timesketch API.
+
+    Yields:
+      a record per event.
+    """
+    # Mirror the internal fields added by search.Search.to_pandas().
+    return_fields = self.return_fields.strip("'").split(',')
+    internal_fields = []
+    if self.include_internal_columns:
+      internal_fields = [
+          field for field in _INTERNAL_COLUMNS
+          if not self.return_fields or field in return_fields]
+    timelines = {}
+    if self.sketch and (
+        '_source' in internal_fields or '__ts_timeline_id' in internal_fields):
+      timelines = {
+          timeline.id: timeline.name
+          for timeline in self.sketch.list_timelines()}
+
+    for hit in hits:
+      record = hit.get('_source', {})
+      if self.include_internal_columns:
+        for field in ('_id', '_type', '_index'):
+          if field in internal_fields:
+            record[field] = hit.get(field)
+        if timelines:
+          record['_source'] = timelines.get(hit.get('__ts_timeline_id'))
+      else:
+        for column in _INTERNAL_COLUMNS:
+          record.pop(column, None)
+      if 'datetime' not in record:
+        # Like search.Search.to_pandas(), derive the datetime of events
+        # without one from the timestamp in microseconds.
+        event_datetime = _TimestampToIsoFormat(record.get('timestamp'))
+        if event_datetime:
+          record['datetime'] = event_datetime
+      yield record
 
   def _OutputSearchResults(self, data_frame: pd.DataFrame) -> None:
     """Outputs the search results.
@@ -226,44 +682,58 @@ class TimesketchSearchEventCollector(module.BaseModule):
       data_frame: the dataframe containing the Timesketch events.
     """
     if not self.include_internal_columns:
-      # Remove internal OpenSearch columns
-      data_frame = data_frame.drop(
-          columns=["__ts_timeline_id", "_id", "_index", "_source", "_type"],
-          errors="ignore")
-
-    if self.output_format == 'pandas':
-      self.StoreContainer(
-          containers.DataFrame(
-              name=self.search_name,
-              description=self.search_description,
-              data_frame=data_frame))
-    else:
-      with tempfile.NamedTemporaryFile(
-          mode='w',
-          delete=False,
-          encoding='utf-8',
-          prefix=f'{self.search_name}_' if self.search_name else '',
-          suffix=f'.{self.output_format}') as output_file:
-        if self.output_format == "csv":
-          data_frame.to_csv(output_file, index=False)
-        elif self.output_format == "json":
-          data_frame.to_json(output_file, orient="records", lines=False)
-        elif self.output_format == "jsonl":
-          data_frame.to_json(output_file, orient="records", lines=True)
-        else:
-          self.ModuleError('Unexpected output format', critical=True)
-        self.StoreContainer(containers.File(
+      # Remove internal OpenSearch columns by selecting the remaining ones,
+      # the frame is left untouched if there are none.
+      columns = [
+          column for column in data_frame.columns
+          if column not in _INTERNAL_COLUMNS]
+      if len(columns) != len(data_frame.columns):
+        data_frame = data_frame.loc[:, columns]
+
+    self.StoreContainer(
+        containers.DataFrame(
             name=self.search_name,
             description=self.search_description,
-            path=output_file.name))
+            data_frame=data_frame))
+
+  def _OutputSearchRecords(self, records: Iterable[Dict[str, Any]]) -> None:
+    """Outputs the search records to a file.
+
+    Args:
+      records: the records containing the Timesketch events.
+    """
+    with tempfile.NamedTemporaryFile(
+        mode='wb',
+        buffering=_OUTPUT_BUFFER_SIZE,
+        delete=False,
+        dir=self.output_dir,
+        prefix=f'{self.search_name}_' if self.search_name else '',
+        suffix=f'.{self.output_format}') as output_file:
+      try:
+        _OUTPUT_WRITERS[self.output_format](records, output_file)
+      except Exception as exception:  # pylint: disable=broad-except
+        # The partially written file is not output, so it is removed.
+        output_file.close()
+        os.remove(output_file.name)
+        if isinstance(exception, errors.DFTimewolfError):
+          self.ModuleError(exception.message, critical=True)
+        raise
+      self.StoreContainer(containers.File(
+          name=self.search_name,
+          description=self.search_description,
+          path=output_file.name))
 
   def Process(self) -> None:
     """Processes the Timesketch search query."""
-    data_frame = self._GetSearchResults()
-    self.logger.info(f'Search returned {len(data_frame)} event(s).')
-    if data_frame.empty:
+    hits = self._GetSearchHits()
+    self.logger.info(f'Search returned {len(hits)} event(s).')
+    if not hits:
       return
-    self._OutputSearchResults(data_frame)
+
+    if self.output_format == 'pandas':
+      self._OutputSearchResults(self._HitsToDataFrame(hits))
+    else:
+      self._OutputSearchRecords(self._IterHits(hits))
 
 
 modules_manager.ModulesManager.RegisterModule(TimesketchSearchEventCollector)
@@ -4,6 +4,7 @@ import re
 import threading
 from typing import Sequence, TYPE_CHECKING
 
+from requests import adapters
 from timesketch_api_client import client
 from timesketch_api_client import config
 from timesketch_api_client import crypto
@@ -17,6 +18,9 @@ if TYPE_CHECKING:
 # The name of a ticket attribute that contains the URL to a sketch.
 _SKETCH_ATTRIBUTE_NAME = 'Timesketch URL'
 
+# The number of connections kept alive to the Timesketch server.
+_CONNECTION_POOL_SIZE = 10
+
 LOCK = threading.Lock()
 
 
@@ -40,6 +44,27 @@ def GetSketchIDFromAttributes(
         return sketch_id
   return 0
 
+
+def ConfigureConnectionPool(ts_client: client.TimesketchApi) -> None:
+  """Sizes the connection pool of a Timesketch API client session.
+
+  The session created by the upstream library mounts adapters with the default
+  pool size. The adapters are replaced with ones keeping more connections
+  alive, using the same retry strategy, so that concurrent and repeated
+  requests reuse established connections.
+
+  Args:
+    ts_client: the Timesketch API client.
+  """
+  session = ts_client.session
+  for prefix in ('https://', 'http://'):
+    adapter = session.get_adapter(prefix)
+    session.mount(prefix, adapters.HTTPAdapter(
+        pool_connections=_CONNECTION_POOL_SIZE,
+        pool_maxsize=_CONNECTION_POOL_SIZE,
+        max_retries=adapter.max_retries))
+
+
 def GetApiClient(state: "state.DFTimewolfState",
                  token_password: str='') -> client.TimesketchApi:
   """Returns a Timesketch API client using thread safe methods.
@@ -93,5 +118,6 @@ def GetApiClient(state: "state.DFTimewolfState",
           ts_client.credentials, config_assistant=assistant,
           password=token_password)
 
+    ConfigureConnectionPool(ts_client)
     state.AddToCache('timesketch_client', ts_client)
     return ts_client
@@ -1,13 +1,22 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """Tests the Timesketch collector."""
+import copy
 import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
 import mock
 import pandas as pd
 
+from timesketch_api_client import search
+
 from dftimewolf import config
+from dftimewolf.lib import errors
 from dftimewolf.lib import state
 from dftimewolf.lib.containers import containers
 from dftimewolf.lib.collectors import timesketch
@@ -90,6 +99,82 @@ class TimesketchSearchEventCollectorTest(unittest.TestCase):
     self.assertEqual(timesketch_collector.search_description, 'description')
     mock_timesketch_api.assert_called_with('127.0.0.1', 'user', 'pass')
 
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  def testSetupWithInvalidOutputFormat(self, _mock_get_api_client):
+    """Tests the SetUp function with an unsupported output format."""
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    with self.assertRaises(errors.DFTimewolfError):
+      timesketch_collector.SetUp(
+          sketch_id='1',
+          start_datetime=datetime.datetime(2024, 11, 11),
+          end_datetime=datetime.datetime(2024, 11, 12),
+          output_format='xml',
+          token_password='test_token')
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  def testSetupWithCachedSketch(self, mock_get_api_client):
+    """Tests the SetUp function reusing a cached sketch."""
+    test_state = state.DFTimewolfState(config.Config)
+    cached_sketch = mock.MagicMock(id=1)
+    test_state.AddToCache('timesketch_sketch', cached_sketch)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        token_password='test_token')
+    self.assertIs(timesketch_collector.sketch, cached_sketch)
+    mock_get_api_client.assert_not_called()
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.ConfigureConnectionPool')
+  @mock.patch('timesketch_api_client.client.TimesketchApi')
+  def testSetupWithCachedClient(
+      self, mock_timesketch_api, mock_configure_connection_pool):
+    """Tests the SetUp function reusing the client of an endpoint and user."""
+    test_state = state.DFTimewolfState(config.Config)
+    for _ in range(2):
+      timesketch_collector = timesketch.TimesketchSearchEventCollector(
+          test_state)
+      timesketch_collector.SetUp(
+          sketch_id='1',
+          start_datetime=datetime.datetime(2024, 11, 11),
+          end_datetime=datetime.datetime(2024, 11, 12),
+          endpoint='127.0.0.1',
+          username='user',
+          password='pass')
+
+    mock_timesketch_api.assert_called_once_with('127.0.0.1', 'user', 'pass')
+    mock_configure_connection_pool.assert_called_once_with(
+        mock_timesketch_api.return_value)
+    self.assertIs(
+        test_state.GetFromCache('timesketch_client_127.0.0.1_user'),
+        mock_timesketch_api.return_value)
+    self.assertEqual(
+        mock_timesketch_api.return_value.get_sketch.call_count, 2)
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.client.TimesketchApi')
+  def testSetupWithCachedSketchAndEndpoint(
+      self, mock_timesketch_api, _mock_get_api_client):
+    """Tests the SetUp function ignores the cached sketch for an endpoint."""
+    test_state = state.DFTimewolfState(config.Config)
+    cached_sketch = mock.MagicMock(id=1)
+    test_state.AddToCache('timesketch_sketch', cached_sketch)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        endpoint='127.0.0.1',
+        username='user',
+        password='pass')
+    self.assertIsNot(timesketch_collector.sketch, cached_sketch)
+    self.assertIs(
+        timesketch_collector.sketch,
+        mock_timesketch_api.return_value.get_sketch.return_value)
+    mock_timesketch_api.assert_called_once_with('127.0.0.1', 'user', 'pass')
+
   @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
   @mock.patch('timesketch_api_client.search')
   def testSetup(self, _mock_search, _mock_get_api_client):
@@ -102,6 +187,11 @@ class TimesketchSearchEventCollectorTest(unittest.TestCase):
         start_datetime=datetime.datetime(2024, 11, 11),
         end_datetime=datetime.datetime(2024, 11, 12),
         token_password='test_token')
+    # pylint: disable=protected-access
+    self.assertEqual(
+        timesketch_collector._start_iso, '2024-11-11T00:00:00.000000')
+    self.assertEqual(
+        timesketch_collector._end_iso, '2024-11-12T00:00:00.000000')
     self.assertEqual(timesketch_collector.sketch_id, 1)
     self.assertEqual(timesketch_collector.query_string, '*')
     self.assertEqual(
@@ -114,13 +204,59 @@ class TimesketchSearchEventCollectorTest(unittest.TestCase):
     self.assertEqual(timesketch_collector.search_name, '')
     self.assertEqual(timesketch_collector.search_description, '')
 
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  def testGetReturnFields(self, _mock_get_api_client):
+    """Tests that internal columns are not requested unless included."""
+    # pylint: disable=protected-access
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        return_fields='message,_id,datetime,_index',
+        token_password='test_token')
+    self.assertEqual(
+        timesketch_collector._GetReturnFields(),
+        'message,datetime')
+
+    timesketch_collector.include_internal_columns = True
+    self.assertEqual(
+        timesketch_collector._GetReturnFields(),
+        'message,_id,datetime,_index')
+
   @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
   @mock.patch.object(
       timesketch.TimesketchSearchEventCollector,
-      '_GetSearchResults')
-  def testProcessPandas(self, mock_get_search_results, _mock_get_api_client):
+      '_GetSearchHits')
+  def testProcessPandas(self, mock_get_search_hits, _mock_get_api_client):
     """Test the Process function with Pandas output."""
-    mock_get_search_results.return_value = pd.DataFrame([1, 2])
+    mock_get_search_hits.return_value = [
+        {'_source': {'message': 'one'}}, {'_source': {'message': 'two'}}]
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.DataFrame)
+    self.assertEqual(len(state_containers), 1)
+    pd.testing.assert_frame_equal(
+        state_containers[0].data_frame,
+        pd.DataFrame({'message': ['one', 'two']}))
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch.object(
+      timesketch.TimesketchSearchEventCollector,
+      '_GetSearchHits')
+  def testProcessPandasInternalColumns(
+      self, mock_get_search_hits, _mock_get_api_client):
+    """Test the Process function removes internal columns."""
+    mock_get_search_hits.return_value = [
+        {'_id': 'a', '_source': {'message': 'one', '__ts_timeline_id': 1}}]
     test_state = state.DFTimewolfState(config.Config)
     timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
     timesketch_collector.SetUp(
@@ -133,7 +269,489 @@ class TimesketchSearchEventCollectorTest(unittest.TestCase):
     state_containers = test_state.GetContainers(containers.DataFrame)
     self.assertEqual(len(state_containers), 1)
     pd.testing.assert_frame_equal(
-        state_containers[0].data_frame, pd.DataFrame([1, 2]))
+        state_containers[0].data_frame, pd.DataFrame({'message': ['one']}))
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch.object(
+      timesketch.TimesketchSearchEventCollector,
+      '_HitsToDataFrame')
+  @mock.patch.object(
+      timesketch.TimesketchSearchEventCollector,
+      '_GetSearchHits')
+  def testProcessPandasWithoutHits(
+      self, mock_get_search_hits, mock_hits_to_data_frame,
+      _mock_get_api_client):
+    """Test the Process function without search hits."""
+    mock_get_search_hits.return_value = []
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    mock_hits_to_data_frame.assert_not_called()
+    self.assertEqual(test_state.GetContainers(containers.DataFrame), [])
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessPandasFromHits(self, mock_search, _mock_get_api_client):
+    """Test the Process function building the Pandas output from hits."""
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [
+            {'_source': {
+                'message': 'one', 'datetime': '2024-11-11T01:00:00',
+                'tag': ['x'], '__ts_timeline_id': 1}},
+            {'_source': {
+                'message': 'two', 'datetime': '2024-11-11T02:00:00',
+                'tag': [], '__ts_timeline_id': 1}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.DataFrame)
+    self.assertEqual(len(state_containers), 1)
+    data_frame = state_containers[0].data_frame
+    self.assertEqual(list(data_frame.columns), ['message', 'datetime', 'tag'])
+    self.assertEqual(list(data_frame['message']), ['one', 'two'])
+    self.assertEqual(list(data_frame['tag']), [['x'], []])
+    self.assertTrue(
+        pd.api.types.is_datetime64_any_dtype(data_frame['datetime']))
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessJsonl(self, mock_search, _mock_get_api_client):
+    """Test the Process function with JSONL output."""
+    output_dir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, output_dir)
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [
+            {'_id': 'a', '_source': {
+                'message': 'one', '__ts_timeline_id': 1}},
+            {'_id': 'b', '_source': {
+                'message': 'two', '__ts_timeline_id': 1}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        output_format='jsonl',
+        output_dir=output_dir,
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    with open(state_containers[0].path, encoding='utf-8') as output_file:
+      records = [json.loads(line) for line in output_file]
+    self.assertEqual(records, [{'message': 'one'}, {'message': 'two'}])
+    self.assertEqual(os.path.dirname(state_containers[0].path), output_dir)
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessMissingOutputDir(self, mock_search, _mock_get_api_client):
+    """Test the Process function creates a missing output directory."""
+    base_dir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, base_dir)
+    output_dir = os.path.join(base_dir, 'missing', 'output')
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [{'_source': {'message': 'one'}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        output_format='jsonl',
+        output_dir=output_dir,
+        token_password='test_token')
+    self.assertTrue(os.path.isdir(output_dir))
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    self.assertEqual(os.path.dirname(state_containers[0].path), output_dir)
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessMultipleIndices(self, mock_search, mock_get_api_client):
+    """Test the Process function searching several indices concurrently."""
+    mock_sketch = mock_get_api_client.return_value.get_sketch.return_value
+    mock_sketch.list_timelines.return_value = [
+        mock.MagicMock(id=1), mock.MagicMock(id=2)]
+    first_search = mock.MagicMock()
+    first_search.to_dict.return_value = {'objects': [
+        {'_source': {'message': 'one', 'datetime': '2024-11-11T01:00:00'}},
+        {'_source': {'message': 'four', 'datetime': '2024-11-11T04:00:00'}}]}
+    second_search = mock.MagicMock()
+    second_search.to_dict.return_value = {'objects': [
+        {'_source': {'message': 'two', 'datetime': '2024-11-11T02:00:00'}},
+        {'_source': {'message': 'three', 'datetime': '2024-11-11T03:00:00'}}]}
+    mock_search.side_effect = [first_search, second_search]
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        indices='1,2',
+        output_format='jsonl',
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    # pylint: disable=protected-access
+    self.assertEqual(first_search._indices, ['1'])
+    self.assertEqual(second_search._indices, ['2'])
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    with open(state_containers[0].path, encoding='utf-8') as output_file:
+      messages = [json.loads(line)['message'] for line in output_file]
+    self.assertEqual(messages, ['one', 'two', 'three', 'four'])
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessInvalidIndices(self, mock_search, mock_get_api_client):
+    """Test the Process function skips indices that are not timelines."""
+    mock_sketch = mock_get_api_client.return_value.get_sketch.return_value
+    mock_sketch.list_timelines.return_value = [mock.MagicMock(id=1)]
+    mock_search.return_value.to_dict.return_value = {'objects': [
+        {'_source': {'message': 'one', 'datetime': '2024-11-11T01:00:00'}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        indices='1,999',
+        output_format='jsonl',
+        token_password='test_token')
+    with self.assertLogs(timesketch_collector.logger, 'WARNING') as logs:
+      timesketch_collector.Process()
+
+    mock_search.assert_called_once()
+    # pylint: disable=protected-access
+    self.assertEqual(mock_search.return_value._indices, ['1'])
+    self.assertIn('999', logs.output[0])
+    mock_sketch.list_timelines.assert_called_once()
+    self.assertEqual(len(test_state.GetContainers(containers.File)), 1)
+
+    timesketch_collector.indices = [998, 999]
+    with self.assertRaises(errors.DFTimewolfError):
+      timesketch_collector.Process()
+
+  @mock.patch.object(timesketch, '_SEARCH_SIZE_LIMIT', 3)
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessMultipleIndicesLimit(
+      self, mock_search, mock_get_api_client):
+    """Test the merged per index searches are capped to a single search."""
+    mock_sketch = mock_get_api_client.return_value.get_sketch.return_value
+    mock_sketch.list_timelines.return_value = [
+        mock.MagicMock(id=1), mock.MagicMock(id=2)]
+    first_search = mock.MagicMock()
+    first_search.to_dict.return_value = {'objects': [
+        {'_source': {'message': 'one', 'datetime': '2024-11-11T01:00:00'}},
+        {'_source': {'message': 'three', 'datetime': '2024-11-11T03:00:00'}},
+        {'_source': {'message': 'five', 'datetime': '2024-11-11T05:00:00'}}]}
+    second_search = mock.MagicMock()
+    second_search.to_dict.return_value = {'objects': [
+        {'_source': {'message': 'two', 'datetime': '2024-11-11T02:00:00'}},
+        {'_source': {'message': 'four', 'datetime': '2024-11-11T04:00:00'}}]}
+    mock_search.side_effect = [first_search, second_search]
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        indices='1,2',
+        output_format='jsonl',
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    with open(state_containers[0].path, encoding='utf-8') as output_file:
+      messages = [json.loads(line)['message'] for line in output_file]
+    self.assertEqual(messages, ['one', 'two', 'three'])
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessCsv(self, mock_search, _mock_get_api_client):
+    """Test the Process function with CSV output."""
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [
+            {'_source': {'message': 'one'}},
+            {'_source': {'message': 'two', 'tag': 'x'}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        output_format='csv',
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    data_frame = pd.read_csv(state_containers[0].path, keep_default_na=False)
+    pd.testing.assert_frame_equal(
+        data_frame,
+        pd.DataFrame({'message': ['one', 'two'], 'tag': ['', 'x']}))
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessCsvNestedValues(self, mock_search, _mock_get_api_client):
+    """Test the Process function with CSV output and nested values."""
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [
+            {'_source': {'message': 'one', 'tag': ['x']}},
+            {'_source': {'message': 'two', 'tag': []}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(2024, 11, 11),
+        end_datetime=datetime.datetime(2024, 11, 12),
+        output_format='csv',
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    data_frame = pd.read_csv(state_containers[0].path, keep_default_na=False)
+    pd.testing.assert_frame_equal(
+        data_frame,
+        pd.DataFrame({'message': ['one', 'two'], 'tag': ["['x']", '[]']}))
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  def testProcessMatchesDataFrameOutput(self, _mock_get_api_client):
+    """Test the file output holds the events of the former dataframe output.
+
+    The output used to be written from search.Search.to_pandas(), only the
+    representation of the datetime differs.
+    """
+    hits = [
+        {'_id': 'a', '_index': 'i', '_type': '_doc', '_source': {
+            'message': 'one', 'data_type': 'fs:stat',
+            'timestamp': 1731286800000000, '__ts_timeline_id': 1}},
+        {'_id': 'b', '_index': 'i', '_type': '_doc', '_source': {
+            'message': 'two, "quoted"', 'data_type': 'fs:stat',
+            'timestamp': 1731290400123456, '__ts_timeline_id': 1}}]
+    baseline_search = mock.MagicMock(
+        _raw_response={'objects': copy.deepcopy(hits)}, return_fields='')
+    baseline_search._sketch.list_timelines.return_value = []
+    baseline_frame = search.Search.to_pandas(baseline_search).drop(
+        columns=['__ts_timeline_id', '_id', '_index', '_source', '_type'])
+
+    for output_format in ('csv', 'json', 'jsonl'):
+      with self.subTest(output_format=output_format):
+        test_state = state.DFTimewolfState(config.Config)
+        timesketch_collector = timesketch.TimesketchSearchEventCollector(
+            test_state)
+        with mock.patch('timesketch_api_client.search.Search') as mock_search:
+          mock_search.return_value.to_dict.return_value = {
+              'objects': copy.deepcopy(hits)}
+          timesketch_collector.SetUp(
+              sketch_id='1',
+              start_datetime=datetime.datetime(2024, 11, 11),
+              end_datetime=datetime.datetime(2024, 11, 12),
+              output_format=output_format,
+              token_password='test_token')
+          timesketch_collector.Process()
+        output_path = test_state.GetContainers(containers.File)[0].path
+
+        baseline_file = io.StringIO()
+        if output_format == 'csv':
+          baseline_frame.to_csv(baseline_file, index=False)
+          baseline_file.seek(0)
+          expected = pd.read_csv(baseline_file)
+          data_frame = pd.read_csv(output_path)
+          for frame in (expected, data_frame):
+            frame['datetime'] = pd.to_datetime(
+                frame['datetime'], format='mixed').dt.floor('us').astype(
+                    'datetime64[us, UTC]')
+          pd.testing.assert_frame_equal(data_frame, expected)
+          continue
+
+        baseline_frame.to_json(
+            baseline_file, orient='records', lines=output_format == 'jsonl',
+            date_format='epoch')
+        if output_format == 'json':
+          expected = json.loads(baseline_file.getvalue())
+          with open(output_path, encoding='utf-8') as output_file:
+            records = json.load(output_file)
+        else:
+          expected = [
+              json.loads(line)
+              for line in baseline_file.getvalue().splitlines()]
+          with open(output_path, encoding='utf-8') as output_file:
+            records = [json.loads(line) for line in output_file]
+        # The former output held the datetime in milliseconds since epoch.
+        for record in expected:
+          record['datetime'] = datetime.datetime(
+              1970, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(
+                  milliseconds=record['datetime'])
+        for record in records:
+          event_datetime = datetime.datetime.fromisoformat(record['datetime'])
+          record['datetime'] = event_datetime.replace(
+              microsecond=event_datetime.microsecond // 1000 * 1000)
+        self.assertEqual(records, expected)
+
+  def testDumpJson(self):
+    """Tests both JSON serializers write the same bytes."""
+    records = [
+        ({'message': 'één', 'tag': ['x'], 'size': 1, 'sha': None},
+         '{"message":"één","tag":["x"],"size":1,"sha":null}'.encode('utf-8')),
+        ({'inode': 2**64 + 5}, b'{"inode":18446744073709551621}')]
+
+    for has_orjson in sorted({False, timesketch.HAS_ORJSON}):
+      for record, expected_bytes in records:
+        with self.subTest(has_orjson=has_orjson, record=record):
+          with mock.patch.object(timesketch, 'HAS_ORJSON', has_orjson):
+            # pylint: disable=protected-access
+            self.assertEqual(timesketch._DumpJson(record), expected_bytes)
+
+  @unittest.skipIf(not timesketch.HAS_PYARROW, 'Missing pyarrow dependency.')
+  def testWriteCsv(self):
+    """Tests both CSV writers produce the same bytes."""
+    flat_records = [
+        {'message': 'one, "1"', 'timestamp': 1, 'tag': 'x'},
+        {'message': 'two', 'timestamp': 2}]
+    nested_records = [
+        {'message': 'one', 'timestamp': 1, 'tag': ['x'], 'starred': True},
+        {'message': 'two', 'timestamp': None, 'tag': [], 'starred': False}]
+    expected = {
+        'flat': (
+            b'"message","timestamp","tag"\n'
+            b'"one, ""1""",1,"x"\n'
+            b'"two",2,\n'),
+        'nested': (
+            b'"message","timestamp","tag","starred"\n'
+            b'"one",1,"[\'x\']","True"\n'
+            b'"two",,"[]","False"\n')}
+    records = {'flat': flat_records, 'nested': nested_records}
+
+    for has_pyarrow in sorted({False, timesketch.HAS_PYARROW}):
+      for name, expected_bytes in expected.items():
+        with self.subTest(has_pyarrow=has_pyarrow, records=name):
+          output_file = io.BytesIO()
+          with mock.patch.object(timesketch, 'HAS_PYARROW', has_pyarrow):
+            # pylint: disable=protected-access
+            timesketch._WriteCsv(records[name], output_file)
+          self.assertEqual(output_file.getvalue(), expected_bytes)
+
+  @unittest.skipIf(not timesketch.HAS_PYARROW, 'Missing pyarrow dependency.')
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessParquet(self, mock_search, _mock_get_api_client):
+    """Test the Process function with Parquet output."""
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [
+            {'_source': {'message': 'one', 'timestamp': 1}},
+            {'_source': {'message': 'two', 'timestamp': 2}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(
+            2024, 11, 11, tzinfo=datetime.timezone.utc),
+        end_datetime=datetime.datetime(
+            2024, 11, 12, tzinfo=datetime.timezone.utc),
+        output_format='parquet',
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    self.assertTrue(state_containers[0].path.endswith('.parquet'))
+    table = timesketch.pyarrow_parquet.read_table(state_containers[0].path)
+    self.assertEqual(
+        table.schema.field('datetime').type,
+        timesketch.pyarrow.timestamp('us', tz='UTC'))
+    pd.testing.assert_frame_equal(
+        table.to_pandas(),
+        pd.DataFrame({
+            'message': ['one', 'two'],
+            'timestamp': [1, 2],
+            'datetime': pd.to_datetime(
+                [1, 2], unit='us', utc=True).as_unit('us')}))
+
+  @unittest.skipIf(not timesketch.HAS_PYARROW, 'Missing pyarrow dependency.')
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessParquetMixedTypes(self, mock_search, _mock_get_api_client):
+    """Test the Process function with Parquet output of mixed type fields."""
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [
+            {'_source': {
+                'message': 'one', 'port': 22, 'tag': ['x'], 'inode': 1}},
+            {'_source': {
+                'message': 'two', 'port': 'ssh', 'tag': [],
+                'inode': 2**63 + 5}},
+            {'_source': {'message': 'three'}}]}
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(
+            2024, 11, 11, tzinfo=datetime.timezone.utc),
+        end_datetime=datetime.datetime(
+            2024, 11, 12, tzinfo=datetime.timezone.utc),
+        output_format='parquet',
+        token_password='test_token')
+    timesketch_collector.Process()
+
+    state_containers = test_state.GetContainers(containers.File)
+    self.assertEqual(len(state_containers), 1)
+    table = timesketch.pyarrow_parquet.read_table(state_containers[0].path)
+    self.assertEqual(table.column('port').to_pylist(), ['22', 'ssh', None])
+    self.assertEqual(table.column('tag').to_pylist(), [['x'], [], None])
+    self.assertEqual(
+        table.column('inode').to_pylist(), ['1', str(2**63 + 5), None])
+
+  @mock.patch('dftimewolf.lib.timesketch_utils.GetApiClient')
+  @mock.patch('timesketch_api_client.search.Search')
+  def testProcessOutputError(self, mock_search, _mock_get_api_client):
+    """Test the Process function removes the output file on errors."""
+    mock_search.return_value.to_dict.return_value = {
+        'objects': [{'_source': {'message': 'one', 'timestamp': 1}}]}
+    output_dir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, output_dir)
+    test_state = state.DFTimewolfState(config.Config)
+    timesketch_collector = timesketch.TimesketchSearchEventCollector(test_state)
+    timesketch_collector.SetUp(
+        sketch_id='1',
+        start_datetime=datetime.datetime(
+            2024, 11, 11, tzinfo=datetime.timezone.utc),
+        end_datetime=datetime.datetime(
+            2024, 11, 12, tzinfo=datetime.timezone.utc),
+        output_format='jsonl',
+        token_password='test_token',
+        output_dir=output_dir)
+
+    for exception in (
+        errors.DFTimewolfError('Unable to write', critical=True),
+        TypeError('Type is not JSON serializable')):
+      with self.subTest(exception=type(exception).__name__):
+        failing_writer = mock.Mock(side_effect=exception)
+        with mock.patch.dict(
+            timesketch._OUTPUT_WRITERS,  # pylint: disable=protected-access
+            {'jsonl': failing_writer}):
+          with self.assertRaises(type(exception)):
+            timesketch_collector.Process()
+
+        self.assertEqual(os.listdir(output_dir), [])
+        self.assertEqual(test_state.GetContainers(containers.File), [])
 
 
 if __name__ == '__main__':
@@ -4,6 +4,8 @@
 
 import unittest
 
+import requests
+
 from dftimewolf import config
 from dftimewolf.lib import state
 from dftimewolf.lib import timesketch_utils
@@ -12,6 +14,10 @@ class FakeTimesketchApiClient(object):
   """Fake API Client Class."""
   TYPE = 'client'
 
+  def __init__(self):
+    """Initializes the fake API client."""
+    self.session = requests.Session()
+
 
 class TimesketchUtilsTest(unittest.TestCase):
   """Tests for the Timesketch utils."""
@@ -25,6 +31,21 @@ class TimesketchUtilsTest(unittest.TestCase):
     timesketch_client = timesketch_utils.GetApiClient(wolf_state)
     self.assertIsNotNone(timesketch_client)
 
+  def testConfigureConnectionPool(self):
+    """Tests that the session adapters are resized and keep their retries."""
+    ts_client = FakeTimesketchApiClient()
+    max_retries = {
+        prefix: ts_client.session.get_adapter(prefix).max_retries
+        for prefix in ('https://', 'http://')}
+
+    timesketch_utils.ConfigureConnectionPool(ts_client)
+
+    for prefix, retries in max_retries.items():
+      adapter = ts_client.session.get_adapter(prefix)
+      # pylint: disable=protected-access
+      self.assertEqual(adapter._pool_maxsize, 10)
+      self.assertIs(adapter.max_retries, retries)
+
 
 if __name__ == '__main__':
   unittest.main()